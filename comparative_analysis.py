@@ -1,12 +1,28 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from plot_common import PNG_KW
 import numpy as np
 import os
 import glob
+import csv
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 
 class ComparativeAnalysis:
+    METRIC_LABELS = {
+        "avg_cwnd": "Average Window Size",
+        "std_cwnd": "Window Size Std. Dev.",
+        "avg_rtt": "Average RTT (ms)",
+        "std_rtt": "RTT Standard Deviation (ms)",
+        "avg_sending_rate": "Average Sending Rate (Mbps)",
+        "std_sending_rate": "Sending Rate Std. Dev. (Mbps)",
+        "total_retrans": "Total Retransmissions",
+        "retrans_rate": "Retransmission Rate (%)"
+    }
+    
     def __init__(self, results_dir="./results"):
         self.results_dir = results_dir
         self.cc_schemes = ["reno", "cubic", "bbr", "bbr2", "vegas"]
@@ -16,81 +32,93 @@ class ComparativeAnalysis:
         
     def load_summary_data(self):
         """Load summary data from CSV files"""
-        data = []
+        tables = []
         for file in glob.glob(f"{self.results_dir}/summary_*.csv"):
-            df = pd.read_csv(file)
-            data.append(df)
+            with open(file, newline='') as f:
+                header, *rows = csv.reader(f)
+            # Skip blank lines and pad short rows so every column gets one cell per row
+            rows = [row + [''] * (len(header) - len(row)) for row in rows if row]
+            tables.append((dict(zip(header, zip(*rows))), len(rows)))
         
-        if not data:
+        if not tables:
             raise ValueError(f"No summary files found in {self.results_dir}")
         
-        return pd.concat(data, ignore_index=True)
+        # simple_experiment and metrics_processor write different columns to summary_*.csv,
+        # so pad the columns a file lacks with empty cells (loaded as NaN)
+        names = dict.fromkeys(itertools.chain.from_iterable(columns for columns, _ in tables))
+        chunks = {name: [columns.get(name, ('',) * n_rows) for columns, n_rows in tables] for name in names}
+        
+        data = {}
+        for name, parts in chunks.items():
+            if name in ("cc_scheme", "scenario"):
+                data[name] = [value or None for value in itertools.chain.from_iterable(parts)]
+            else:
+                # Empty cells (e.g. NaN std values) become NaN
+                data[name] = pd.to_numeric(np.concatenate(parts), errors='coerce').astype(np.float64)
+        
+        return pd.DataFrame(data)
     
-    def plot_metric_by_scenario(self, df, metric, output_dir="./plots/comparative"):
+    def plot_metric_by_scenario(self, summary, metric, output_dir="./plots/comparative"):
         """Plot metric comparison across CC schemes for each scenario"""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
         
-        plt.figure(figsize=(12, 8))
+        fig = Figure(figsize=(12, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         
-        # Group by CC scheme and scenario
-        grouped = df.groupby(['cc_scheme', 'scenario'])
+        m_idx = self.metrics.index(metric)
         
         width = 0.15
         indices = np.arange(len(self.scenarios))
         
         for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = grouped.get_group((cc, sc))[metric].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            plt.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
+            ax.bar(indices + i*width, summary[m_idx, i], width, label=cc.upper(), color=self.colors[cc])
         
-        plt.xlabel('Scenario')
-        plt.ylabel(self.get_metric_label(metric))
-        plt.title(f'Comparison of {self.get_metric_label(metric)} Across CC Schemes')
-        plt.xticks(indices + width*2, self.scenarios)
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--', alpha=0.7)
+        ax.set_xlabel('Scenario')
+        ax.set_ylabel(self.get_metric_label(metric))
+        ax.set_title(f'Comparison of {self.get_metric_label(metric)} Across CC Schemes')
+        ax.set_xticks(indices + width*2, self.scenarios)
+        ax.legend()
+        ax.grid(True, axis='y', linestyle='--', alpha=0.7)
         
-        plt.savefig(f"{output_dir}/{metric}_comparison.png")
-        plt.close()
+        fig.savefig(f"{output_dir}/{metric}_comparison.png", **PNG_KW)
+    
+    def summary_array(self, df):
+        """Arrange summary data as a (metric x cc_scheme x scenario) array, 0 where missing"""
+        # The summary table is tiny, so a plain dict lookup beats a pandas groupby
+        lookup = {(r['cc_scheme'], r['scenario']): r for r in df.to_dict('records')}
+        values = np.array([
+            [[lookup.get((cc, sc), {}).get(metric, 0.0) for sc in self.scenarios] for cc in self.cc_schemes]
+            for metric in self.metrics
+        ], dtype=np.float32)
+        # Metric-major C-order so each bar series summary[m_idx, i] is a contiguous row
+        return np.nan_to_num(values, copy=False)
     
     def get_metric_label(self, metric):
         """Return a readable label for each metric"""
-        labels = {
-            "avg_cwnd": "Average Window Size",
-            "std_cwnd": "Window Size Std. Dev.",
-            "avg_rtt": "Average RTT (ms)",
-            "std_rtt": "RTT Standard Deviation (ms)",
-            "avg_sending_rate": "Average Sending Rate (Mbps)",
-            "std_sending_rate": "Sending Rate Std. Dev. (Mbps)",
-            "total_retrans": "Total Retransmissions",
-            "retrans_rate": "Retransmission Rate (%)"
-        }
-        return labels.get(metric, metric)
+        return self.METRIC_LABELS.get(metric, metric)
     
     def plot_all_comparative_metrics(self):
         """Generate all comparative plots"""
         df = self.load_summary_data()
+        summary = self.summary_array(df)
         
-        for metric in self.metrics:
-            self.plot_metric_by_scenario(df, metric)
+        # Each metric plot is independent, so render them on separate cores
+        workers = min(len(self.metrics), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.plot_metric_by_scenario, itertools.repeat(summary), self.metrics))
         
         # Generate Fig. 10 style composite figure
-        self.generate_composite_figure(df)
+        self.generate_composite_figure(summary)
     
-    def generate_composite_figure(self, df):
+    def generate_composite_figure(self, summary):
         """Generate a composite figure similar to Fig. 10 in the paper"""
         output_dir = "./plots/composite"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
         
-        fig, axs = plt.subplots(3, 2, figsize=(15, 15))
+        fig = Figure(figsize=(15, 15))
+        FigureCanvasAgg(fig)
+        axs = fig.subplots(3, 2)
         
         # Define metrics to plot
         plot_metrics = [
@@ -102,23 +130,13 @@ class ComparativeAnalysis:
             ("retrans_rate", "Retransmission Rate (%)", axs[2, 1])
         ]
         
-        # Group by CC scheme and scenario
-        grouped = df.groupby(['cc_scheme', 'scenario'])
-        
         width = 0.15
         indices = np.arange(len(self.scenarios))
         
         for metric, title, ax in plot_metrics:
+            m_idx = self.metrics.index(metric)
             for i, cc in enumerate(self.cc_schemes):
-                values = []
-                for sc in self.scenarios:
-                    try:
-                        val = grouped.get_group((cc, sc))[metric].values[0]
-                        values.append(val)
-                    except:
-                        values.append(0)
-                
-                ax.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
+                ax.bar(indices + i*width, summary[m_idx, i], width, label=cc.upper(), color=self.colors[cc])
             
             ax.set_xlabel('Scenario')
             ax.set_ylabel(title)
@@ -131,9 +149,8 @@ class ComparativeAnalysis:
         handles, labels = axs[0, 0].get_legend_handles_labels()
         fig.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, 0.98), ncol=5)
         
-        plt.tight_layout(rect=[0, 0, 1, 0.96])  # Adjust layout to make room for the legend
-        plt.savefig(f"{output_dir}/fig10_composite.png")
-        plt.close()
+        fig.tight_layout(rect=[0, 0, 1, 0.96])  # Adjust layout to make room for the legend
+        fig.savefig(f"{output_dir}/fig10_composite.png", **PNG_KW)
 
 def main():
     analyzer = ComparativeAnalysis()
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from plot_common import PNG_KW
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import os
 
 def generate_cwnd_evolution_plots():
@@ -12,239 +16,170 @@ def generate_cwnd_evolution_plots():
         os.makedirs('plots')
     
     # Time axis
-    time = np.arange(0, 600)
+    time = np.arange(0, 600, dtype=np.float32)
     
-    # Set up random seed for reproducibility
-    np.random.seed(42)
+    # Set up a seeded generator for reproducibility
+    rng = np.random.default_rng(42)
+    
+    # Draw the noise for all 15 series (sc0, sc1, sc2 of each scheme) in one call:
+    # rows 0-2 BBRv1, 3-5 BBRv2, 6-8 Reno, 9-11 CUBIC, 12-14 Vegas
+    noise_stds = np.array([150, 80, 50, 40, 30, 20, 10, 8, 5, 25, 20, 15, 10, 5, 3], dtype=np.float32)
+    noise = rng.standard_normal((noise_stds.size, len(time)), dtype=np.float32) * noise_stds[:, None]
     
     # Define color scheme for scenarios
     colors = {'sc0': 'black', 'sc1': 'red', 'sc2': 'blue'}
     
-    # Create figure with 5 subplots (one for each CC scheme)
-    plt.figure(figsize=(12, 15))
+    # Create figure with 5 subplots (one for each CC scheme) in a single call
+    fig = Figure(figsize=(12, 15))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(5, 2).flat
+    for unused_ax in axes[5:]:
+        unused_ax.remove()
+    
+    # Draw the sc0/sc1/sc2 windows of one scheme as a single LineCollection
+    def plot_scenarios(ax, windows, title):
+        scenarios = list(colors)
+        lines = LineCollection([np.column_stack([time, w]) for w in windows],
+                               colors=[colors[sc] for sc in scenarios])
+        ax.add_collection(lines)
+        ax.autoscale_view()
+        ax.set_title(title)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('CWND')
+        ax.set_ylim(0, 1000)
+        ax.legend(handles=[Line2D([], [], color=colors[sc], label=sc) for sc in scenarios])
+    
+    # Probe RTT drop windows: every 100 samples starting at t=10
+    drop_offsets = time[:, None] - np.arange(10, len(time), 100)[None, :]
+    bbr_drop = ((drop_offsets >= 0) & (drop_offsets < 10)).any(axis=1)
+    bbr2_drop = ((drop_offsets >= 0) & (drop_offsets < 5)).any(axis=1)
     
     # BBRv1 - high window sizes with high variability
-    plt.subplot(5, 2, 1)
-    
     # SC0 - highest window size
     base_window_bbr_sc0 = 700
-    noise_bbr_sc0 = np.random.normal(0, 150, len(time))
-    # Add probe RTT drops
-    for i in range(10, len(time), 100):
-        noise_bbr_sc0[i:i+10] = -650
-    window_bbr_sc0 = np.maximum(base_window_bbr_sc0 + noise_bbr_sc0, 4)
+    window_bbr_sc0 = np.maximum(np.where(bbr_drop, base_window_bbr_sc0 - 650, base_window_bbr_sc0 + noise[0]), 4)
     
     # SC1 - medium window size
     base_window_bbr_sc1 = 350
-    noise_bbr_sc1 = np.random.normal(0, 80, len(time))
-    # Add probe RTT drops
-    for i in range(10, len(time), 100):
-        noise_bbr_sc1[i:i+10] = -300
-    window_bbr_sc1 = np.maximum(base_window_bbr_sc1 + noise_bbr_sc1, 4)
+    window_bbr_sc1 = np.maximum(np.where(bbr_drop, base_window_bbr_sc1 - 300, base_window_bbr_sc1 + noise[1]), 4)
     
     # SC2 - lowest window size
     base_window_bbr_sc2 = 200
-    noise_bbr_sc2 = np.random.normal(0, 50, len(time))
-    # Add probe RTT drops
-    for i in range(10, len(time), 100):
-        noise_bbr_sc2[i:i+10] = -150
-    window_bbr_sc2 = np.maximum(base_window_bbr_sc2 + noise_bbr_sc2, 4)
+    window_bbr_sc2 = np.maximum(np.where(bbr_drop, base_window_bbr_sc2 - 150, base_window_bbr_sc2 + noise[2]), 4)
     
     # Truncate to make it look like the experiment ended
     window_bbr_sc0[300:] = np.nan
     window_bbr_sc1[400:] = np.nan
     window_bbr_sc2[200:] = np.nan
     
-    plt.plot(time, window_bbr_sc0, color=colors['sc0'], label='sc0')
-    plt.plot(time, window_bbr_sc1, color=colors['sc1'], label='sc1')
-    plt.plot(time, window_bbr_sc2, color=colors['sc2'], label='sc2')
-    plt.title('(a) BBRv1')
-    plt.xlabel('Time (s)')
-    plt.ylabel('CWND')
-    plt.ylim(0, 1000)
-    plt.legend()
+    plot_scenarios(axes[0], (window_bbr_sc0, window_bbr_sc1, window_bbr_sc2), '(a) BBRv1')
     
     # BBRv2 - less aggressive, more stable
-    plt.subplot(5, 2, 2)
-    
-    # SC0 - high window size but less variable
+    # SC0 - high window size but less variable, with less dramatic probe RTT drops
     base_window_bbr2_sc0 = 300
-    noise_bbr2_sc0 = np.random.normal(0, 40, len(time))
-    # Add probe RTT drops (less dramatic)
-    for i in range(10, len(time), 100):
-        noise_bbr2_sc0[i:i+5] = -150
-    window_bbr2_sc0 = np.maximum(base_window_bbr2_sc0 + noise_bbr2_sc0, 4)
+    window_bbr2_sc0 = np.maximum(np.where(bbr2_drop, base_window_bbr2_sc0 - 150, base_window_bbr2_sc0 + noise[3]), 4)
     
     # SC1 - medium window size
     base_window_bbr2_sc1 = 180
-    noise_bbr2_sc1 = np.random.normal(0, 30, len(time))
-    # Add probe RTT drops
-    for i in range(10, len(time), 100):
-        noise_bbr2_sc1[i:i+5] = -100
-    window_bbr2_sc1 = np.maximum(base_window_bbr2_sc1 + noise_bbr2_sc1, 4)
+    window_bbr2_sc1 = np.maximum(np.where(bbr2_drop, base_window_bbr2_sc1 - 100, base_window_bbr2_sc1 + noise[4]), 4)
     
     # SC2 - lowest window size
     base_window_bbr2_sc2 = 120
-    noise_bbr2_sc2 = np.random.normal(0, 20, len(time))
-    # Add probe RTT drops
-    for i in range(10, len(time), 100):
-        noise_bbr2_sc2[i:i+5] = -60
-    window_bbr2_sc2 = np.maximum(base_window_bbr2_sc2 + noise_bbr2_sc2, 4)
+    window_bbr2_sc2 = np.maximum(np.where(bbr2_drop, base_window_bbr2_sc2 - 60, base_window_bbr2_sc2 + noise[5]), 4)
     
     # Truncate
     window_bbr2_sc0[500:] = np.nan
     window_bbr2_sc1[500:] = np.nan
     window_bbr2_sc2[500:] = np.nan
     
-    plt.plot(time, window_bbr2_sc0, color=colors['sc0'], label='sc0')
-    plt.plot(time, window_bbr2_sc1, color=colors['sc1'], label='sc1')
-    plt.plot(time, window_bbr2_sc2, color=colors['sc2'], label='sc2')
-    plt.title('(b) BBRv2')
-    plt.xlabel('Time (s)')
-    plt.ylabel('CWND')
-    plt.ylim(0, 1000)
-    plt.legend()
+    plot_scenarios(axes[1], (window_bbr2_sc0, window_bbr2_sc1, window_bbr2_sc2), '(b) BBRv2')
     
     # Reno - more variable, saw-tooth pattern
-    plt.subplot(5, 2, 3)
-    
     # Create sawtooth pattern for Reno
     def sawtooth(x, period, amplitude, offset):
-        return offset + amplitude * (x % period) / period
-    
-    # SC0 - moderate window size with sawtooth pattern
-    window_reno_sc0 = np.zeros_like(time, dtype=float)
-    for i in range(10):
-        start = i * 50
-        end = min((i + 1) * 50, len(time))
-        if i % 3 == 0:  # Some randomness in pattern
-            period = 30
-            amplitude = 150
-            offset = 100
-        else:
-            period = 25
-            amplitude = 120
-            offset = 80
-        window_reno_sc0[start:end] = sawtooth(time[start:end], period, amplitude, offset)
-    window_reno_sc0 += np.random.normal(0, 10, len(time))
+        return (offset + amplitude * (x % period) / period).astype(np.float32, copy=False)
+    
+    # SC0 - moderate window size with sawtooth pattern; every third
+    # 50-sample segment uses a longer, taller tooth
+    wide_segment = (time // 50) % 3 == 0
+    window_reno_sc0 = sawtooth(time, np.where(wide_segment, 30, 25),
+                               np.where(wide_segment, 150, 120),
+                               np.where(wide_segment, 100, 80))
+    window_reno_sc0 += noise[6]
     
     # SC1 - smaller window size
-    window_reno_sc1 = np.zeros_like(time, dtype=float)
-    for i in range(10):
-        start = i * 50
-        end = min((i + 1) * 50, len(time))
-        period = 20
-        amplitude = 80
-        offset = 60
-        window_reno_sc1[start:end] = sawtooth(time[start:end], period, amplitude, offset)
-    window_reno_sc1 += np.random.normal(0, 8, len(time))
+    window_reno_sc1 = sawtooth(time, 20, 80, 60) + noise[7]
     
     # SC2 - even smaller window size
-    window_reno_sc2 = np.zeros_like(time, dtype=float)
-    for i in range(10):
-        start = i * 50
-        end = min((i + 1) * 50, len(time))
-        period = 15
-        amplitude = 50
-        offset = 40
-        window_reno_sc2[start:end] = sawtooth(time[start:end], period, amplitude, offset)
-    window_reno_sc2 += np.random.normal(0, 5, len(time))
+    window_reno_sc2 = sawtooth(time, 15, 50, 40) + noise[8]
     
     # Truncate
     window_reno_sc0[400:] = np.nan
     window_reno_sc1[300:] = np.nan
     window_reno_sc2[300:] = np.nan
     
-    plt.plot(time, window_reno_sc0, color=colors['sc0'], label='sc0')
-    plt.plot(time, window_reno_sc1, color=colors['sc1'], label='sc1')
-    plt.plot(time, window_reno_sc2, color=colors['sc2'], label='sc2')
-    plt.title('(c) Reno')
-    plt.xlabel('Time (s)')
-    plt.ylabel('CWND')
-    plt.ylim(0, 1000)
-    plt.legend()
+    plot_scenarios(axes[2], (window_reno_sc0, window_reno_sc1, window_reno_sc2), '(c) Reno')
     
     # CUBIC - cubic function pattern
-    plt.subplot(5, 2, 4)
-    
     # SC0 - higher window size with cubic pattern
-    window_cubic_sc0 = np.zeros_like(time, dtype=float)
+    window_cubic_sc0 = np.zeros_like(time, dtype=np.float32)
     for i in range(5):
         start = i * 100
         end = min((i + 1) * 100, len(time))
         t = np.linspace(0, 1, end - start)
         window_cubic_sc0[start:end] = 300 * t**3 + 50
-    window_cubic_sc0 += np.random.normal(0, 25, len(time))
+    window_cubic_sc0 += noise[9]
     
     # SC1 - medium window size
-    window_cubic_sc1 = np.zeros_like(time, dtype=float)
+    window_cubic_sc1 = np.zeros_like(time, dtype=np.float32)
     for i in range(5):
         start = i * 100
         end = min((i + 1) * 100, len(time))
         t = np.linspace(0, 1, end - start)
         window_cubic_sc1[start:end] = 200 * t**3 + 40
-    window_cubic_sc1 += np.random.normal(0, 20, len(time))
+    window_cubic_sc1 += noise[10]
     
     # SC2 - lower window size
-    window_cubic_sc2 = np.zeros_like(time, dtype=float)
+    window_cubic_sc2 = np.zeros_like(time, dtype=np.float32)
     for i in range(5):
         start = i * 100
         end = min((i + 1) * 100, len(time))
         t = np.linspace(0, 1, end - start)
         window_cubic_sc2[start:end] = 150 * t**3 + 30
-    window_cubic_sc2 += np.random.normal(0, 15, len(time))
+    window_cubic_sc2 += noise[11]
     
     # Truncate
     window_cubic_sc0[500:] = np.nan
     window_cubic_sc1[500:] = np.nan
     window_cubic_sc2[500:] = np.nan
     
-    plt.plot(time, window_cubic_sc0, color=colors['sc0'], label='sc0')
-    plt.plot(time, window_cubic_sc1, color=colors['sc1'], label='sc1')
-    plt.plot(time, window_cubic_sc2, color=colors['sc2'], label='sc2')
-    plt.title('(d) CUBIC')
-    plt.xlabel('Time (s)')
-    plt.ylabel('CWND')
-    plt.ylim(0, 1000)
-    plt.legend()
+    plot_scenarios(axes[3], (window_cubic_sc0, window_cubic_sc1, window_cubic_sc2), '(d) CUBIC')
     
     # Vegas - more stable, lower values
-    plt.subplot(5, 2, 5)
-    
     # SC0 - stable, moderate window
     base_window_vegas_sc0 = 150
-    noise_vegas_sc0 = np.random.normal(0, 10, len(time))
-    window_vegas_sc0 = base_window_vegas_sc0 + noise_vegas_sc0
+    window_vegas_sc0 = base_window_vegas_sc0 + noise[12]
     
     # SC1 - stable, lower window
     base_window_vegas_sc1 = 80
-    noise_vegas_sc1 = np.random.normal(0, 5, len(time))
-    window_vegas_sc1 = base_window_vegas_sc1 + noise_vegas_sc1
+    window_vegas_sc1 = base_window_vegas_sc1 + noise[13]
     
     # SC2 - stable, even lower window
     base_window_vegas_sc2 = 50
-    noise_vegas_sc2 = np.random.normal(0, 3, len(time))
-    window_vegas_sc2 = base_window_vegas_sc2 + noise_vegas_sc2
+    window_vegas_sc2 = base_window_vegas_sc2 + noise[14]
     
     # Truncate - Vegas takes longer to complete due to lower rate
     window_vegas_sc0[900:] = np.nan
     window_vegas_sc1[700:] = np.nan
     window_vegas_sc2[600:] = np.nan
     
-    plt.plot(time, window_vegas_sc0, color=colors['sc0'], label='sc0')
-    plt.plot(time, window_vegas_sc1, color=colors['sc1'], label='sc1')
-    plt.plot(time, window_vegas_sc2, color=colors['sc2'], label='sc2')
-    plt.title('(e) Vegas')
-    plt.xlabel('Time (s)')
-    plt.ylabel('CWND')
-    plt.ylim(0, 1000)
-    plt.legend()
-    
-    plt.tight_layout()
-    plt.figtext(0.5, 0.01, 'FIGURE 9. Evolution of the congestion window for the studied CC schemes in scenarios SC0 (no interference), SC1 (low interference) and SC2 (strong\ninterference).', 
+    plot_scenarios(axes[4], (window_vegas_sc0, window_vegas_sc1, window_vegas_sc2), '(e) Vegas')
+    
+    fig.tight_layout()
+    fig.text(0.5, 0.01, 'FIGURE 9. Evolution of the congestion window for the studied CC schemes in scenarios SC0 (no interference), SC1 (low interference) and SC2 (strong\ninterference).', 
                 ha='center', fontsize=9)
     
-    plt.savefig('plots/cwnd_evolution.png', dpi=300, bbox_inches='tight')
+    fig.savefig('plots/cwnd_evolution.png', dpi=300, bbox_inches='tight', **PNG_KW)
     print("Congestion window evolution plot saved to plots/cwnd_evolution.png")
 
 if __name__ == "__main__":
@@ -1,130 +1,138 @@
 #!/usr/bin/env python3
 
 import re
-import time
+import csv
+import mmap
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from plot_common import PNG_KW
 import numpy as np
 import os
 import argparse
 
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+TCP_MONITOR_PATTERN = re.compile(rb"TCP_MONITOR: sock=(\S+) cwnd=(\d+) rtt=(\d+) bytes_in_flight=(\d+) retrans=(\d+)")
+
+# Typed columns filled from each TCP_MONITOR match, in capture-group order
+LOG_COLUMNS = [
+    ('socket', object),
+    ('cwnd', np.int32),
+    ('rtt', np.int32),
+    ('bytes_in_flight', np.int64),
+    ('retrans', np.int32)
+]
+
 class TCPMetricsProcessor:
     def __init__(self, log_file="/var/log/kern.log"):
         self.log_file = log_file
-        self.data = {
-            'timestamp': [],
-            'socket': [],
-            'cwnd': [],
-            'rtt': [],
-            'bytes_in_flight': [],
-            'retrans': []
-        }
+        self.df = pd.DataFrame(columns=['timestamp'] + [name for name, _ in LOG_COLUMNS])
     
     def parse_log(self):
         """Parse the kernel log file to extract TCP metrics"""
-        pattern = r"TCP_MONITOR: sock=(\S+) cwnd=(\d+) rtt=(\d+) bytes_in_flight=(\d+) retrans=(\d+)"
+        with open(self.log_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                rows = TCP_MONITOR_PATTERN.findall(buf)
         
-        with open(self.log_file, 'r') as f:
-            for line in f:
-                if "TCP_MONITOR" in line:
-                    match = re.search(pattern, line)
-                    if match:
-                        timestamp = time.time()
-                        socket, cwnd, rtt, bytes_in_flight, retrans = match.groups()
-                        
-                        self.data['timestamp'].append(timestamp)
-                        self.data['socket'].append(socket)
-                        self.data['cwnd'].append(int(cwnd))
-                        self.data['rtt'].append(int(rtt))
-                        self.data['bytes_in_flight'].append(int(bytes_in_flight))
-                        self.data['retrans'].append(int(retrans))
+        # Fill each typed column in one pass over the matches, sized up front from the match count
+        n = len(rows)
+        groups = zip(*rows) if rows else [()] * len(LOG_COLUMNS)
+        columns = {}
+        for (name, dtype), values in zip(LOG_COLUMNS, groups):
+            convert = bytes.decode if dtype is object else int
+            columns[name] = np.fromiter(map(convert, values), dtype=dtype, count=n)
+        
+        # Log lines carry no usable timestamp, so index samples sequentially
+        data = {'timestamp': np.arange(n, dtype=np.float64)}
+        data.update(columns)
+        self.df = pd.DataFrame(data, copy=False)
     
     def to_dataframe(self):
-        """Convert collected data to a pandas DataFrame"""
-        return pd.DataFrame(self.data)
+        """Return the parsed metrics as a pandas DataFrame"""
+        return self.df
     
     def calculate_sending_rate(self, df, window_size=5):
         """Calculate sending rate based on bytes_in_flight and RTT"""
         if len(df) < 2:
             return df
         
-        # Calculate sending rate in Mbps
-        df['sending_rate'] = (df['bytes_in_flight'] * 8) / (df['rtt'] * 1000)  # Convert to Mbps
+        # Calculate sending rate in Mbps: bytes_in_flight * 8 / (rtt * 1000)
+        bif = df['bytes_in_flight'].to_numpy(dtype=np.float64)
+        rtt = df['rtt'].to_numpy(dtype=np.float64)
+        rate = np.empty_like(bif)
+        np.multiply(bif, 8.0 / 1000.0, out=rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(rate, rtt, out=rate)
         
         # Apply rolling window to smooth the data
-        df['sending_rate'] = df['sending_rate'].rolling(window=window_size, min_periods=1).mean()
+        if bn is not None:
+            df['sending_rate'] = bn.move_mean(rate, window=min(window_size, rate.size), min_count=1)
+        else:
+            df['sending_rate'] = pd.Series(rate, index=df.index).rolling(window=window_size, min_periods=1).mean()
         
         return df
     
     def plot_metrics(self, df, cc_scheme, scenario, output_dir="./plots"):
         """Generate plots for the metrics"""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Set time relative to the start
+        # Sample index relative to the first sample (timestamp is a sequential index, not seconds)
         df['rel_time'] = df['timestamp'] - df['timestamp'].iloc[0]
         
-        # Plot congestion window
-        plt.figure(figsize=(10, 6))
-        plt.plot(df['rel_time'], df['cwnd'], 'b-')
-        plt.title(f'Congestion Window Evolution - {cc_scheme} - {scenario}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('CWND (packets)')
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/cwnd_{cc_scheme}_{scenario}.png")
-        plt.close()
-        
-        # Plot RTT
-        plt.figure(figsize=(10, 6))
-        plt.plot(df['rel_time'], df['rtt'], 'r-')
-        plt.title(f'Round Trip Time - {cc_scheme} - {scenario}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('RTT (ms)')
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/rtt_{cc_scheme}_{scenario}.png")
-        plt.close()
+        plots = [
+            ('cwnd', 'b-', 'Congestion Window Evolution', 'CWND (packets)'),
+            ('rtt', 'r-', 'Round Trip Time', 'RTT (ms)'),
+            ('sending_rate', 'g-', 'Sending Rate', 'Sending Rate (Mbps)'),
+            ('retrans', 'm-', 'Packet Retransmissions', 'Retransmissions'),
+        ]
         
-        # Plot sending rate
-        plt.figure(figsize=(10, 6))
-        plt.plot(df['rel_time'], df['sending_rate'], 'g-')
-        plt.title(f'Sending Rate - {cc_scheme} - {scenario}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Sending Rate (Mbps)')
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/sending_rate_{cc_scheme}_{scenario}.png")
-        plt.close()
+        # Reuse one figure and axes for every plot instead of creating four
+        fig = Figure(figsize=(10, 6))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         
-        # Plot retransmissions
-        plt.figure(figsize=(10, 6))
-        plt.plot(df['rel_time'], df['retrans'], 'm-')
-        plt.title(f'Packet Retransmissions - {cc_scheme} - {scenario}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Retransmissions')
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/retrans_{cc_scheme}_{scenario}.png")
-        plt.close()
+        for column, style, title, ylabel in plots:
+            ax.cla()
+            ax.plot(df['rel_time'], df[column], style)
+            ax.set_title(f'{title} - {cc_scheme} - {scenario}')
+            ax.set_xlabel('Sample')
+            ax.set_ylabel(ylabel)
+            ax.grid(True)
+            canvas.print_png(f"{output_dir}/{column}_{cc_scheme}_{scenario}.png", **PNG_KW)
     
     def generate_summary(self, df, cc_scheme, scenario, output_dir="./results"):
         """Generate summary statistics for the metrics"""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        
+        stats = df[['cwnd', 'rtt', 'sending_rate']].agg(['mean', 'std'])
+        retrans = df['retrans'].to_numpy()
+        total_retrans = int(retrans[-1] - retrans[0]) if retrans.size > 1 else 0
         
         summary = {
             'cc_scheme': cc_scheme,
             'scenario': scenario,
-            'avg_cwnd': df['cwnd'].mean(),
-            'std_cwnd': df['cwnd'].std(),
-            'avg_rtt': df['rtt'].mean(),
-            'std_rtt': df['rtt'].std(),
-            'avg_sending_rate': df['sending_rate'].mean(),
-            'std_sending_rate': df['sending_rate'].std(),
-            'total_retrans': df['retrans'].iloc[-1] - df['retrans'].iloc[0] if len(df) > 1 else 0,
-            'retrans_rate': (df['retrans'].iloc[-1] - df['retrans'].iloc[0]) / len(df) if len(df) > 1 else 0
+            'avg_cwnd': stats.loc['mean', 'cwnd'],
+            'std_cwnd': stats.loc['std', 'cwnd'],
+            'avg_rtt': stats.loc['mean', 'rtt'],
+            'std_rtt': stats.loc['std', 'rtt'],
+            'avg_sending_rate': stats.loc['mean', 'sending_rate'],
+            'std_sending_rate': stats.loc['std', 'sending_rate'],
+            'total_retrans': total_retrans,
+            'retrans_rate': total_retrans / retrans.size if retrans.size > 1 else 0
         }
         
         # Save to CSV
-        summary_df = pd.DataFrame([summary])
-        summary_df.to_csv(f"{output_dir}/summary_{cc_scheme}_{scenario}.csv", index=False)
+        with open(f"{output_dir}/summary_{cc_scheme}_{scenario}.csv", 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(summary))
+            writer.writeheader()
+            # Leave NaN stats (e.g. std of a single sample) as empty cells, as DataFrame.to_csv did
+            writer.writerow({key: '' if pd.isna(value) else value for key, value in summary.items()})
         
         return summary
 
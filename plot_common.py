@@ -0,0 +1,13 @@
+import matplotlib
+matplotlib.use('Agg')
+
+# Settings shared by the plotting scripts; importing this module before pyplot applies them.
+# Output is batch PNG only, so no interactive redraws; long paths are simplified and drawn in chunks
+matplotlib.rcParams.update({'interactive': False, 'path.simplify': True,
+                            'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000})
+
+# PNG encoder options for every plot written: no Software text chunk and a cheaper zlib level
+PNG_KW = dict(metadata={'Software': None}, pil_kwargs={'compress_level': 3})
+
+# Fixed-dpi savefig arguments for the summary bar charts
+SAVE_KW = dict(PNG_KW, dpi=100)
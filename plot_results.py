@@ -1,93 +1,95 @@
 #!/usr/bin/env python3
 
+from plot_common import SAVE_KW  # also selects Agg and the shared rcParams before pyplot loads
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import os
 import glob
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from summary_data import read_summary_csvs
+
+SUMMARY_COLUMNS = ['cc_scheme', 'scenario', 'avg_throughput', 'transfer_time', 'rtt']
+
+# Compact in-memory dtypes: labels as categories, metrics in float32. Categories are the sorted
+# labels actually read, so every scheme keeps its rows and bars are drawn in alphabetical order
+SUMMARY_DTYPES = {'cc_scheme': 'category', 'scenario': 'category',
+                  'avg_throughput': 'float32', 'transfer_time': 'float32', 'rtt': 'float32'}
+
+# Grouped bar layout shared by the scenario comparison plots
+BAR_SCENARIOS = ['sc0', 'sc1', 'sc2']
+BAR_X = np.arange(len(BAR_SCENARIOS))
+BAR_WIDTH = 0.2
 
 def load_results():
     """Load results from all summary files"""
-    data = []
-    
-    for file in glob.glob("results/summary_*.csv"):
-        df = pd.read_csv(file)
-        data.append(df)
+    files = glob.glob("results/summary_*.csv")
     
-    if not data:
+    if not files:
         raise ValueError("No summary files found in results directory")
     
-    return pd.concat(data, ignore_index=True)
+    # Key the cache on modification times so rewritten summaries are parsed again
+    return read_summaries(tuple((file, os.path.getmtime(file)) for file in files))
+
+@functools.cache
+def read_summaries(file_mtimes):
+    """Parse the given (path, mtime) summary files into one DataFrame"""
+    # Only read the columns the plots consume
+    df = read_summary_csvs([file for file, _ in file_mtimes], SUMMARY_COLUMNS)
+    return df.astype({col: dtype for col, dtype in SUMMARY_DTYPES.items() if col in df})
+
+def summary_pivot(df):
+    """Pivot every metric to cc_scheme rows and (metric, scenario) columns in one pass"""
+    metrics = [col for col in SUMMARY_COLUMNS[2:] if col in df]
+    # Only schemes with results get a row, ordered by category
+    return df.groupby(['cc_scheme', 'scenario'], observed=True)[metrics].first().unstack('scenario')
+
+def metric_matrix(pivot, metric, cc_schemes, scenarios):
+    """Return a metric as a (cc_scheme x scenario) array, 0 where missing"""
+    # fill_value covers absent runs and columns; fillna covers NaN values that were read
+    columns = pd.MultiIndex.from_product([[metric], scenarios])
+    return pivot.reindex(index=cc_schemes, columns=columns, fill_value=0).fillna(0).to_numpy()
 
-def plot_throughput_comparison(df):
+def draw_bars(ax, values, cc_schemes):
+    """Draw one bar per CC scheme in each scenario group, centred on the group tick"""
+    offsets = (np.arange(len(cc_schemes)) - len(cc_schemes)/2 + 0.5) * BAR_WIDTH
+    for row, offset, cc in zip(values, offsets, cc_schemes):
+        ax.bar(BAR_X + offset, row, BAR_WIDTH, label=cc.upper())
+
+def plot_throughput_comparison(pivot, ax):
     """Plot throughput comparison across CC schemes for different scenarios"""
-    plt.figure(figsize=(12, 8))
-    
-    cc_schemes = sorted(df['cc_scheme'].unique())
-    scenarios = ['sc0', 'sc1', 'sc2']
-    
-    # Set width of bars
-    width = 0.2
-    x = np.arange(len(scenarios))
-    
     # Plot bars for each CC scheme
-    for i, cc in enumerate(cc_schemes):
-        values = []
-        for sc in scenarios:
-            try:
-                val = df[(df['cc_scheme'] == cc) & (df['scenario'] == sc)]['avg_throughput'].values[0]
-                values.append(val)
-            except:
-                values.append(0)
-        
-        plt.bar(x + (i - len(cc_schemes)/2 + 0.5) * width, values, width, label=cc.upper())
+    cc_schemes = pivot.index.tolist()
+    draw_bars(ax, metric_matrix(pivot, 'avg_throughput', cc_schemes, BAR_SCENARIOS), cc_schemes)
     
-    plt.xlabel('Scenario')
-    plt.ylabel('Throughput (Mbits/sec)')
-    plt.title('Throughput Comparison Across CC Schemes')
-    plt.xticks(x, scenarios)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Scenario')
+    ax.set_ylabel('Throughput (Mbits/sec)')
+    ax.set_title('Throughput Comparison Across CC Schemes')
+    ax.set_xticks(BAR_X, BAR_SCENARIOS)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Save plot
-    plt.savefig("plots/throughput_comparison.png")
-    plt.close()
+    ax.figure.savefig("plots/throughput_comparison.png", **SAVE_KW)
 
-def plot_transfer_time_comparison(df):
+def plot_transfer_time_comparison(pivot, ax):
     """Plot transfer time comparison across CC schemes for different scenarios"""
-    plt.figure(figsize=(12, 8))
-    
-    cc_schemes = sorted(df['cc_scheme'].unique())
-    scenarios = ['sc0', 'sc1', 'sc2']
-    
-    # Set width of bars
-    width = 0.2
-    x = np.arange(len(scenarios))
-    
     # Plot bars for each CC scheme
-    for i, cc in enumerate(cc_schemes):
-        values = []
-        for sc in scenarios:
-            try:
-                val = df[(df['cc_scheme'] == cc) & (df['scenario'] == sc)]['transfer_time'].values[0]
-                values.append(val)
-            except:
-                values.append(0)
-        
-        plt.bar(x + (i - len(cc_schemes)/2 + 0.5) * width, values, width, label=cc.upper())
+    cc_schemes = pivot.index.tolist()
+    draw_bars(ax, metric_matrix(pivot, 'transfer_time', cc_schemes, BAR_SCENARIOS), cc_schemes)
     
-    plt.xlabel('Scenario')
-    plt.ylabel('Transfer Time (s)')
-    plt.title('Transfer Time Comparison Across CC Schemes')
-    plt.xticks(x, scenarios)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Scenario')
+    ax.set_ylabel('Transfer Time (s)')
+    ax.set_title('Transfer Time Comparison Across CC Schemes')
+    ax.set_xticks(BAR_X, BAR_SCENARIOS)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Save plot
-    plt.savefig("plots/transfer_time_comparison.png")
-    plt.close()
+    ax.figure.savefig("plots/transfer_time_comparison.png", **SAVE_KW)
 
-def plot_rtt_analysis(df):
+def plot_rtt_analysis(df, axs):
     """Plot RTT analysis for cubic"""
     # Filter for RTT scenarios with cubic
     df_rtt = df[df['scenario'].isin(['sc3', 'sc4', 'sc5', 'sc6', 'sc7']) & (df['cc_scheme'] == 'cubic')]
@@ -96,82 +98,57 @@ def plot_rtt_analysis(df):
         print("No RTT data found for cubic")
         return
     
-    plt.figure(figsize=(12, 8))
-    
     # Plot throughput vs RTT
-    plt.subplot(2, 1, 1)
-    plt.plot(df_rtt['rtt'], df_rtt['avg_throughput'], 'o-', linewidth=2)
-    plt.xlabel('RTT (ms)')
-    plt.ylabel('Throughput (Mbits/sec)')
-    plt.title('Throughput vs RTT for CUBIC')
-    plt.grid(True)
+    axs[0].plot(df_rtt['rtt'], df_rtt['avg_throughput'], 'o-', linewidth=2)
+    axs[0].set_xlabel('RTT (ms)')
+    axs[0].set_ylabel('Throughput (Mbits/sec)')
+    axs[0].set_title('Throughput vs RTT for CUBIC')
+    axs[0].grid(True)
     
     # Plot transfer time vs RTT
-    plt.subplot(2, 1, 2)
-    plt.plot(df_rtt['rtt'], df_rtt['transfer_time'], 'o-', linewidth=2)
-    plt.xlabel('RTT (ms)')
-    plt.ylabel('Transfer Time (s)')
-    plt.title('Transfer Time vs RTT for CUBIC')
-    plt.grid(True)
-    
-    plt.tight_layout()
-    plt.savefig("plots/rtt_analysis.png")
-    plt.close()
+    axs[1].plot(df_rtt['rtt'], df_rtt['transfer_time'], 'o-', linewidth=2)
+    axs[1].set_xlabel('RTT (ms)')
+    axs[1].set_ylabel('Transfer Time (s)')
+    axs[1].set_title('Transfer Time vs RTT for CUBIC')
+    axs[1].grid(True)
+    
+    fig = axs[0].figure
+    fig.tight_layout()
+    fig.savefig("plots/rtt_analysis.png", **SAVE_KW)
 
-def plot_combined_results(df):
+def plot_combined_results(pivot, axs):
     """Create a combined plot similar to Figure 10 in the paper"""
-    plt.figure(figsize=(15, 10))
-    
-    cc_schemes = sorted(df['cc_scheme'].unique())
-    scenarios = ['sc0', 'sc1', 'sc2']
-    
-    # Set width of bars
-    width = 0.2
-    x = np.arange(len(scenarios))
+    cc_schemes = pivot.index.tolist()
     
     # Plot throughput
-    plt.subplot(2, 1, 1)
-    for i, cc in enumerate(cc_schemes):
-        values = []
-        for sc in scenarios:
-            try:
-                val = df[(df['cc_scheme'] == cc) & (df['scenario'] == sc)]['avg_throughput'].values[0]
-                values.append(val)
-            except:
-                values.append(0)
-        
-        plt.bar(x + (i - len(cc_schemes)/2 + 0.5) * width, values, width, label=cc.upper())
+    draw_bars(axs[0], metric_matrix(pivot, 'avg_throughput', cc_schemes, BAR_SCENARIOS), cc_schemes)
     
-    plt.xlabel('Scenario')
-    plt.ylabel('Throughput (Mbits/sec)')
-    plt.title('(a) Average Throughput')
-    plt.xticks(x, scenarios)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    axs[0].set_xlabel('Scenario')
+    axs[0].set_ylabel('Throughput (Mbits/sec)')
+    axs[0].set_title('(a) Average Throughput')
+    axs[0].set_xticks(BAR_X, BAR_SCENARIOS)
+    axs[0].legend()
+    axs[0].grid(axis='y', linestyle='--', alpha=0.7)
     
     # Plot transfer time
-    plt.subplot(2, 1, 2)
-    for i, cc in enumerate(cc_schemes):
-        values = []
-        for sc in scenarios:
-            try:
-                val = df[(df['cc_scheme'] == cc) & (df['scenario'] == sc)]['transfer_time'].values[0]
-                values.append(val)
-            except:
-                values.append(0)
-        
-        plt.bar(x + (i - len(cc_schemes)/2 + 0.5) * width, values, width, label=cc.upper())
-    
-    plt.xlabel('Scenario')
-    plt.ylabel('Transfer Time (s)')
-    plt.title('(b) Flow Completion Time')
-    plt.xticks(x, scenarios)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    plt.tight_layout()
-    plt.savefig("plots/composite/fig10_composite.png")
-    plt.close()
+    draw_bars(axs[1], metric_matrix(pivot, 'transfer_time', cc_schemes, BAR_SCENARIOS), cc_schemes)
+    
+    axs[1].set_xlabel('Scenario')
+    axs[1].set_ylabel('Transfer Time (s)')
+    axs[1].set_title('(b) Flow Completion Time')
+    axs[1].set_xticks(BAR_X, BAR_SCENARIOS)
+    axs[1].legend()
+    axs[1].grid(axis='y', linestyle='--', alpha=0.7)
+    
+    fig = axs[0].figure
+    fig.tight_layout()
+    fig.savefig("plots/composite/fig10_composite.png", **SAVE_KW)
+
+def render_plot(plot, data, figsize, nrows=1):
+    """Draw one plot function into a fresh figure with nrows stacked axes, then close it"""
+    fig, axs = plt.subplots(nrows, 1, figsize=figsize)
+    plot(data, axs)
+    plt.close(fig)
 
 def main():
     try:
@@ -182,11 +159,18 @@ def main():
         print("Loaded results:")
         print(df)
         
-        # Create plots
-        plot_throughput_comparison(df)
-        plot_transfer_time_comparison(df)
-        plot_rtt_analysis(df)
-        plot_combined_results(df)
+        # Pivot once; the bar charts and the composite share the same matrices
+        pivot = summary_pivot(df)
+        
+        # Each figure is independent, so draw and PNG-encode them on separate cores
+        jobs = [
+            (plot_throughput_comparison, pivot, (12, 8), 1),
+            (plot_transfer_time_comparison, pivot, (12, 8), 1),
+            (plot_rtt_analysis, df, (12, 8), 2),
+            (plot_combined_results, pivot, (15, 10), 2),
+        ]
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            list(executor.map(render_plot, *zip(*jobs)))
         
         print("Plots generated successfully in the 'plots' directory")
         
@@ -1,239 +1,111 @@
 #!/usr/bin/env python3
 
 import pandas as pd
+from plot_common import SAVE_KW  # also selects Agg and the shared rcParams before pyplot loads
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 import glob
 import argparse
+from summary_data import read_summary_csvs
+
+SUMMARY_COLUMNS = ['cc_scheme', 'scenario', 'avg_rtt', 'std_rtt', 'avg_sending_rate', 'transfer_time']
+
+# Compact in-memory dtypes for the metrics; labels become categories in load_data
+SUMMARY_DTYPES = {'avg_rtt': 'float32', 'std_rtt': 'float32', 'avg_sending_rate': 'float32', 'transfer_time': 'float32'}
 
 class RTTAnalyzer:
+    # Minimum RTT (ms) configured for each RTT test scenario
+    SCENARIO_MIN_RTT = {"sc3": 5, "sc4": 10, "sc5": 50, "sc6": 100, "sc7": 150}
+    
     def __init__(self, results_dir="./results"):
         self.results_dir = results_dir
         self.cc_schemes = ["reno", "cubic", "bbr", "bbr2", "vegas"]
         self.scenarios = ["sc3", "sc4", "sc5", "sc6", "sc7"]  # RTT test scenarios
-        self.rtts = [5, 10, 50, 100, 150]  # Corresponding minimum RTTs
+        self.rtts = [self.SCENARIO_MIN_RTT[sc] for sc in self.scenarios]  # Corresponding minimum RTTs
         self.colors = {"reno": "black", "cubic": "blue", "bbr": "red", "bbr2": "orange", "vegas": "green"}
     
     def load_data(self):
         """Load data from all summary files"""
-        data = []
+        files = glob.glob(f"{self.results_dir}/summary_*_sc*.csv")
         
-        for file in glob.glob(f"{self.results_dir}/summary_*_sc*.csv"):
-            df = pd.read_csv(file)
-            
-            # Extract scenario from filename
-            if "_sc3" in file:
-                df["min_rtt"] = 5
-            elif "_sc4" in file:
-                df["min_rtt"] = 10
-            elif "_sc5" in file:
-                df["min_rtt"] = 50
-            elif "_sc6" in file:
-                df["min_rtt"] = 100
-            elif "_sc7" in file:
-                df["min_rtt"] = 150
-            
-            data.append(df)
-        
-        if not data:
+        if not files:
             raise ValueError(f"No summary files found in {self.results_dir}")
         
-        return pd.concat(data, ignore_index=True)
-    
-    def plot_rtt_analysis(self, df, output_dir="./plots"):
-        """Generate plots for RTT analysis (similar to Figure 11)"""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        # Only read the columns the plots consume
+        df = read_summary_csvs(files, SUMMARY_COLUMNS)
         
-        # Filter by RTT scenarios only
-        df_rtt = df[df['scenario'].isin(self.scenarios)]
+        # Non-RTT scenarios (sc0-sc2) get a min_rtt of 0
+        df = df.assign(min_rtt=df['scenario'].map(self.SCENARIO_MIN_RTT).fillna(0).astype('int16'))
         
-        # Generate Figure 11a: Average RTT
-        plt.figure(figsize=(12, 8))
+        # Labels become categories of the values read so scheme/scenario filters and grouping work
+        # on integer codes; schemes outside self.cc_schemes keep their rows rather than turning NaN
+        dtypes = {col: dtype for col, dtype in SUMMARY_DTYPES.items() if col in df}
+        dtypes.update(cc_scheme='category', scenario='category')
+        return df.astype(dtypes)
+    
+    def plot_grouped_bars(self, ax, values, ylabel, title, add_rttmin=False):
+        """Draw one grouped bar panel from a (cc_scheme x scenario) value matrix"""
         width = 0.15
         indices = np.arange(len(self.scenarios))
         
         for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['avg_rtt'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            plt.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
+            ax.bar(indices + i*width, values[i], width, label=cc.upper(), color=self.colors[cc])
         
         # Add a line for minimum RTT values
-        plt.plot(indices, self.rtts, 'k--', label='RTTmin')
-        
-        plt.xlabel('Scenario')
-        plt.ylabel('Average RTT (ms)')
-        plt.title('(a) Average RTT')
-        plt.xticks(indices + width*2, self.scenarios)
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--', alpha=0.7)
-        plt.savefig(f"{output_dir}/rtt_analysis_avg_rtt.png")
-        plt.close()
-        
-        # Generate Figure 11b: RTT Standard Deviation
-        plt.figure(figsize=(12, 8))
-        
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['std_rtt'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            plt.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        plt.xlabel('Scenario')
-        plt.ylabel('RTT Standard Deviation (ms)')
-        plt.title('(b) RTT Standard Deviation')
-        plt.xticks(indices + width*2, self.scenarios)
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--', alpha=0.7)
-        plt.savefig(f"{output_dir}/rtt_analysis_std_rtt.png")
-        plt.close()
-        
-        # Generate Figure 11c: Average Sending Rate
-        plt.figure(figsize=(12, 8))
-        
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['avg_sending_rate'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            plt.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        plt.xlabel('Scenario')
-        plt.ylabel('Average Sending Rate (Mbps)')
-        plt.title('(c) Average Sending Rate')
-        plt.xticks(indices + width*2, self.scenarios)
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--', alpha=0.7)
-        plt.savefig(f"{output_dir}/rtt_analysis_sending_rate.png")
-        plt.close()
-        
-        # Generate Figure 11d: Flow Completion Time
-        plt.figure(figsize=(12, 8))
-        
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    # Use the total transfer time as a proxy for flow completion time
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['transfer_time'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            plt.bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        plt.xlabel('Scenario')
-        plt.ylabel('Flow Completion Time (s)')
-        plt.title('(d) Average Flow Completion Time')
-        plt.xticks(indices + width*2, self.scenarios)
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--', alpha=0.7)
-        plt.savefig(f"{output_dir}/rtt_analysis_completion_time.png")
-        plt.close()
+        if add_rttmin:
+            ax.plot(indices, self.rtts, 'k--', label='RTTmin')
+        
+        ax.set_xlabel('Scenario')
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.set_xticks(indices + width*2)
+        ax.set_xticklabels(self.scenarios)
+        ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+    
+    def plot_rtt_analysis(self, df, output_dir="./plots"):
+        """Generate plots for RTT analysis (similar to Figure 11)"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Metric column, y label, title and output file for Figures 11a-11d
+        panels = [
+            ('avg_rtt', 'Average RTT (ms)', '(a) Average RTT', 'rtt_analysis_avg_rtt.png'),
+            ('std_rtt', 'RTT Standard Deviation (ms)', '(b) RTT Standard Deviation', 'rtt_analysis_std_rtt.png'),
+            ('avg_sending_rate', 'Average Sending Rate (Mbps)', '(c) Average Sending Rate', 'rtt_analysis_sending_rate.png'),
+            # Use the total transfer time as a proxy for flow completion time
+            ('transfer_time', 'Flow Completion Time (s)', '(d) Average Flow Completion Time', 'rtt_analysis_completion_time.png'),
+        ]
+        metrics = [metric for metric, _, _, _ in panels]
+        
+        # One hashed groupby over the RTT scenarios; missing runs or columns are plotted as 0
+        df_rtt = df[df['scenario'].isin(self.scenarios)]
+        present = [m for m in metrics if m in df_rtt]
+        lookup = df_rtt.groupby(['cc_scheme', 'scenario'], observed=True)[present].first()
+        columns = pd.MultiIndex.from_product([metrics, self.scenarios])
+        lookup = lookup.unstack('scenario').reindex(index=self.cc_schemes, columns=columns, fill_value=0).fillna(0)
+        
+        # Generate Figures 11a-11d, reusing one figure and clearing it between panels
+        fig, ax = plt.subplots(figsize=(12, 8))
+        for metric, ylabel, title, filename in panels:
+            ax.clear()
+            self.plot_grouped_bars(ax, lookup[metric].to_numpy(), ylabel, title, add_rttmin=metric == 'avg_rtt')
+            ax.legend()
+            fig.savefig(f"{output_dir}/{filename}", **SAVE_KW)
+        plt.close(fig)
         
         # Generate combined Figure 11
         fig, axs = plt.subplots(2, 2, figsize=(15, 12))
         
-        # Figure 11a: Average RTT
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['avg_rtt'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            axs[0, 0].bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        axs[0, 0].plot(indices, self.rtts, 'k--', label='RTTmin')
-        axs[0, 0].set_xlabel('Scenario')
-        axs[0, 0].set_ylabel('Average RTT (ms)')
-        axs[0, 0].set_title('(a) Average RTT')
-        axs[0, 0].set_xticks(indices + width*2)
-        axs[0, 0].set_xticklabels(self.scenarios)
-        axs[0, 0].grid(True, axis='y', linestyle='--', alpha=0.7)
-        
-        # Figure 11b: RTT Standard Deviation
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['std_rtt'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            axs[0, 1].bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        axs[0, 1].set_xlabel('Scenario')
-        axs[0, 1].set_ylabel('RTT Standard Deviation (ms)')
-        axs[0, 1].set_title('(b) RTT Standard Deviation')
-        axs[0, 1].set_xticks(indices + width*2)
-        axs[0, 1].set_xticklabels(self.scenarios)
-        axs[0, 1].grid(True, axis='y', linestyle='--', alpha=0.7)
-        
-        # Figure 11c: Average Sending Rate
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['avg_sending_rate'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            axs[1, 0].bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        axs[1, 0].set_xlabel('Scenario')
-        axs[1, 0].set_ylabel('Average Sending Rate (Mbps)')
-        axs[1, 0].set_title('(c) Average Sending Rate')
-        axs[1, 0].set_xticks(indices + width*2)
-        axs[1, 0].set_xticklabels(self.scenarios)
-        axs[1, 0].grid(True, axis='y', linestyle='--', alpha=0.7)
-        
-        # Figure 11d: Flow Completion Time
-        for i, cc in enumerate(self.cc_schemes):
-            values = []
-            for sc in self.scenarios:
-                try:
-                    val = df_rtt[(df_rtt['cc_scheme'] == cc) & (df_rtt['scenario'] == sc)]['transfer_time'].values[0]
-                    values.append(val)
-                except:
-                    values.append(0)
-            
-            axs[1, 1].bar(indices + i*width, values, width, label=cc.upper(), color=self.colors[cc])
-        
-        axs[1, 1].set_xlabel('Scenario')
-        axs[1, 1].set_ylabel('Flow Completion Time (s)')
-        axs[1, 1].set_title('(d) Average Flow Completion Time')
-        axs[1, 1].set_xticks(indices + width*2)
-        axs[1, 1].set_xticklabels(self.scenarios)
-        axs[1, 1].grid(True, axis='y', linestyle='--', alpha=0.7)
+        for ax, (metric, ylabel, title, _) in zip(axs.flat, panels):
+            self.plot_grouped_bars(ax, lookup[metric].to_numpy(), ylabel, title, add_rttmin=metric == 'avg_rtt')
         
         # Add legend
         handles, labels = axs[0, 0].get_legend_handles_labels()
         fig.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, 0.98), ncol=6)
         
-        plt.tight_layout(rect=[0, 0, 1, 0.96])
-        plt.savefig(f"{output_dir}/rtt_analysis_combined.png")
-        plt.close()
+        fig.tight_layout(rect=[0, 0, 1, 0.96])
+        fig.savefig(f"{output_dir}/rtt_analysis_combined.png", **SAVE_KW)
+        plt.close(fig)
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze RTT for different e2e latencies')
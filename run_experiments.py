@@ -1,23 +1,26 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import glob
 import time
 import subprocess
 import argparse
+import itertools
 from datetime import datetime
 
 def run_command(command):
-    """Run shell command and print output"""
+    """Run shell command, streaming its output"""
     print(f"Executing: {command}")
-    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = process.communicate()
-    
-    if stdout:
-        print(stdout.decode())
-    if stderr:
-        print(stderr.decode())
-    
-    return process.returncode
+    # Inherit our stdout/stderr so output streams as it is produced instead of being buffered
+    sys.stdout.flush()
+    return subprocess.run(command, shell=True).returncode
+
+def wait_for_mininet_cleanup(timeout=5, interval=0.2):
+    """Wait until no Mininet switch interfaces remain, or until timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while glob.glob('/sys/class/net/s*-eth*') and time.monotonic() < deadline:
+        time.sleep(interval)
 
 def setup_environment():
     """Set up the environment for experiments"""
@@ -58,8 +61,8 @@ def run_experiment(cc_scheme, scenario, rtt):
     else:
         print(f"Experiment failed with return code {ret_code}")
     
-    # Wait a bit to ensure everything is cleaned up
-    time.sleep(5)
+    # Make sure the topology has been torn down before the next run
+    wait_for_mininet_cleanup(timeout=5)
     
     return ret_code == 0
 
@@ -70,16 +73,14 @@ def run_all_experiments(cc_schemes, scenarios, rtts):
     # Start time of all experiments
     start_all = time.time()
     
-    for cc in cc_schemes:
-        for sc in scenarios:
-            for rtt in rtts:
-                success = run_experiment(cc, sc, rtt)
-                results.append({
-                    'cc_scheme': cc,
-                    'scenario': sc,
-                    'rtt': rtt,
-                    'success': success
-                })
+    # Runs share fixed Mininet node names, file paths and the kernel log, so they stay sequential
+    for cc, sc, rtt in itertools.product(cc_schemes, scenarios, rtts):
+        results.append({
+            'cc_scheme': cc,
+            'scenario': sc,
+            'rtt': rtt,
+            'success': run_experiment(cc, sc, rtt)
+        })
     
     # End time of all experiments
     end_all = time.time()
@@ -110,7 +111,20 @@ def generate_comparative_analysis():
     print("Generating comparative analysis plots")
     print("="*80)
     
-    ret_code = run_command("python3 comparative_analysis.py")
+    # Run in this interpreter to avoid a second pandas/matplotlib start-up,
+    # falling back to a subprocess if its dependencies are not importable here
+    try:
+        import comparative_analysis
+    except ImportError as e:
+        print(f"Cannot import comparative_analysis ({e}), running it as a subprocess")
+        ret_code = run_command("python3 comparative_analysis.py")
+    else:
+        try:
+            comparative_analysis.main()
+            ret_code = 0
+        except Exception as e:
+            print(f"Error: {e}")
+            ret_code = 1
     
     if ret_code == 0:
         print("Comparative analysis plots generated successfully")
@@ -1,10 +1,40 @@
 #!/usr/bin/env python3
 
 import numpy as np
+from plot_common import PNG_KW  # also selects Agg and the shared rcParams before pyplot loads
 import matplotlib.pyplot as plt
-from scipy.signal import savgol_filter
+from scipy.signal import savgol_coeffs, oaconvolve
 import os
 
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Savitzky-Golay smoothing kernels (window, polyorder), solved once at import
+SG_LIGHT = savgol_coeffs(11, 3)
+SG_STRONG = savgol_coeffs(31, 3)
+
+def smooth(signal, coeffs):
+    """Apply a precomputed Savitzky-Golay kernel, repeating edge samples as padding"""
+    half = len(coeffs) // 2
+    return oaconvolve(np.pad(signal, half, mode='edge'), coeffs, mode='valid')
+
+def synthesize(base_level, noise, t, waves):
+    """Base level plus noise plus (amplitude, period) sinusoids, fused into one pass with numexpr if available"""
+    if ne is not None:
+        terms = ''.join(f" + a{i}*sin(w{i}*t)" for i in range(len(waves)))
+        local_dict = {'base': base_level, 'noise': noise, 't': t}
+        for i, (amplitude, period) in enumerate(waves):
+            local_dict[f"a{i}"] = amplitude
+            local_dict[f"w{i}"] = 2 * np.pi / period
+        return ne.evaluate("base + noise" + terms, local_dict=local_dict)
+    
+    signal = base_level + noise
+    for amplitude, period in waves:
+        signal += amplitude * np.sin(2 * np.pi / period * t)
+    return signal
+
 def generate_signal_strength_plots():
     """Generate signal strength plots similar to Figure 8 in the paper"""
     
@@ -17,26 +47,25 @@ def generate_signal_strength_plots():
     time_sc1 = np.arange(0, 640)
     time_sc2 = np.arange(0, 640)
     
+    # Set up a seeded generator for reproducibility
+    rng = np.random.default_rng(42)
+    
+    # Draw the noise for all three scenarios in one call (std 8, 2 and 3 dB)
+    noise = rng.standard_normal((3, len(time_sc0))) * np.array([8, 2, 3])[:, None]
+    
     # SC0: No interference - moderate variations
     base_level_sc0 = -60
-    noise_sc0 = np.random.normal(0, 8, len(time_sc0))
-    slow_var_sc0 = 8 * np.sin(2 * np.pi * time_sc0 / 200)
-    signal_sc0 = base_level_sc0 + noise_sc0 + slow_var_sc0
-    signal_sc0 = savgol_filter(signal_sc0, 11, 3)  # Smooth the signal
+    signal_sc0 = synthesize(base_level_sc0, noise[0], time_sc0, [(8, 200)])
+    signal_sc0 = smooth(signal_sc0, SG_LIGHT)  # Smooth the signal
     
-    # SC1: Low interference - regular pattern
+    # SC1: Low interference - regular pattern plus slow variation
     base_level_sc1 = -65
-    noise_sc1 = np.random.normal(0, 2, len(time_sc1))
-    interference_sc1 = 15 * np.sin(2 * np.pi * time_sc1 / 20)
-    slow_var_sc1 = 5 * np.sin(2 * np.pi * time_sc1 / 320)
-    signal_sc1 = base_level_sc1 + noise_sc1 + interference_sc1 + slow_var_sc1
+    signal_sc1 = synthesize(base_level_sc1, noise[1, :len(time_sc1)], time_sc1, [(15, 20), (5, 320)])
     
     # SC2: Strong interference - fewer but stronger variations
     base_level_sc2 = -70
-    noise_sc2 = np.random.normal(0, 3, len(time_sc2))
-    interference_sc2 = 12 * np.sin(2 * np.pi * time_sc2 / 160)
-    signal_sc2 = base_level_sc2 + noise_sc2 + interference_sc2
-    signal_sc2 = savgol_filter(signal_sc2, 31, 3)  # Stronger smoothing
+    signal_sc2 = synthesize(base_level_sc2, noise[2, :len(time_sc2)], time_sc2, [(12, 160)])
+    signal_sc2 = smooth(signal_sc2, SG_STRONG)  # Stronger smoothing
     
     # Create the figure and subplots
     plt.figure(figsize=(8, 12))
@@ -72,7 +101,7 @@ def generate_signal_strength_plots():
     plt.figtext(0.5, 0.01, 'FIGURE 8. Signal strength over time in scenario SC0 (with no\ninterference) and scenarios SC1 and SC2 (with interference).', 
                 ha='center', fontsize=9)
     
-    plt.savefig('plots/signal_strength.png', dpi=300, bbox_inches='tight')
+    plt.savefig('plots/signal_strength.png', dpi=300, bbox_inches='tight', **PNG_KW)
     print("Signal strength plot saved to plots/signal_strength.png")
 
 if __name__ == "__main__":
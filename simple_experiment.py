@@ -6,10 +6,34 @@ from mininet.link import TCLink
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info
 
+import re
+import mmap
 import time
 import os
 import argparse
 
+# iperf interval line starting at 0.0, e.g. "0.0-30.0 sec" or "0.0000-30.1287 sec"
+IPERF_INTERVAL_PATTERN = re.compile(rb"\s0\.0+-\s*(\d+\.\d+)\s+sec\s+\S+\s+\S+\s+(\S+)\s+(\S+)")
+
+# Scale from the iperf rate unit to Mbits/sec, the unit the summary and plots use
+IPERF_RATE_SCALE = {b"bits/sec": 1e-6, b"Kbits/sec": 1e-3, b"Mbits/sec": 1.0, b"Gbits/sec": 1e3}
+
+def parse_iperf_throughput(log_file, duration=30):
+    """Return the average throughput (Mbits/sec) from the iperf summary line, 0 if absent"""
+    with open(log_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The summary is the last interval starting at 0.0 that covers the whole run and sits
+            # at the end of the log, so search backwards and only match from each candidate
+            end = len(mm)
+            while (start := mm.rfind(b" 0.0", 0, end)) != -1:
+                match = IPERF_INTERVAL_PATTERN.match(mm, start)
+                if match and float(match.group(1)) >= duration:
+                    return float(match.group(2)) * IPERF_RATE_SCALE.get(match.group(3), 1.0)
+                end = start
+            return 0
+
 def run_experiment(cc_scheme, scenario, rtt):
     """Run a simple TCP experiment with different congestion control algorithms"""
     info(f"*** Starting experiment with {cc_scheme} in scenario {scenario} with RTT {rtt}ms ***\n")
@@ -81,18 +105,7 @@ def run_experiment(cc_scheme, scenario, rtt):
     info(f"*** Experiment completed in {transfer_time:.2f} seconds ***\n")
     
     # Parse iperf output to get average throughput
-    with open(f"results/iperf_{cc_scheme}_{scenario}.log", "r") as f:
-        lines = f.readlines()
-    
-    # Look for the line with the summary (usually the last line)
-    throughput = 0
-    for line in reversed(lines):
-        if "0.0-30.0" in line and "sec" in line:
-            parts = line.split()
-            if len(parts) >= 8:
-                throughput = float(parts[6])
-                throughput_unit = parts[7]
-                break
+    throughput = parse_iperf_throughput(f"results/iperf_{cc_scheme}_{scenario}.log")
     
     # Create a simple CSV summary
     with open(f"results/summary_{cc_scheme}_{scenario}.csv", "w") as f:
@@ -0,0 +1,23 @@
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+LABEL_COLUMNS = ('cc_scheme', 'scenario')
+
+def read_summary_csvs(files, columns):
+    """Read only the given columns of the summary CSVs into one DataFrame"""
+    # Summary files from different tools carry different columns, so absent metrics load as NaN;
+    # pyarrow's multithreaded parser is used when it is installed
+    if pa_csv is not None:
+        options = pa_csv.ConvertOptions(include_columns=columns, include_missing_columns=True,
+                                        column_types={col: pa.float64() for col in columns
+                                                      if col not in LABEL_COLUMNS})
+        tables = [pa_csv.read_csv(file, convert_options=options) for file in files]
+        return pa.concat_tables(tables, promote_options='default').to_pandas()
+    
+    return pd.concat([pd.read_csv(file, usecols=lambda col: col in columns) for file in files],
+                     ignore_index=True)